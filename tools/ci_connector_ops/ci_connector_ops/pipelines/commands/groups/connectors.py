@@ -115,7 +115,7 @@ def connectors(
         logger=logger,
     )
 
-    all_connectors = get_all_released_connectors()
+    all_connectors = get_all_released_connectors(parallel=bool(languages or release_stages))
 
     modified_connectors_and_files = get_modified_connectors(ctx.obj["modified_files"])
     # We select all connectors by default
@@ -3,15 +3,17 @@
 #
 
 import logging
+import mmap
 import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from enum import Enum
-from functools import cached_property
-from glob import glob
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-import git
 import requests
 import yaml
 from ci_credentials import SecretsManager
@@ -19,18 +21,23 @@ from rich.console import Console
 
 try:
     from yaml import CLoader as Loader
+    from yaml import CSafeLoader as SafeLoader
 # Some environments do not have a system C Yaml loader
 except ImportError:
-    from yaml import Loader
+    from yaml import Loader, SafeLoader
 
 console = Console()
 
 DIFFED_BRANCH = os.environ.get("DIFFED_BRANCH", "origin/master")
 OSS_CATALOG_URL = "https://connectors.airbyte.com/files/registries/v0/oss_registry.json"
 CONNECTOR_PATH_PREFIX = "airbyte-integrations/connectors"
+CONNECTOR_NAME_OFFSET = len(CONNECTOR_PATH_PREFIX) + 1
 SOURCE_CONNECTOR_PATH_PREFIX = CONNECTOR_PATH_PREFIX + "/source-"
 DESTINATION_CONNECTOR_PATH_PREFIX = CONNECTOR_PATH_PREFIX + "/destination-"
 ACCEPTANCE_TEST_CONFIG_FILE_NAME = "acceptance-test-config.yml"
+# Git pathspecs: a "*" also matches "/" so these select every file under the source connectors folders.
+SOURCE_CONNECTOR_PATHSPEC = SOURCE_CONNECTOR_PATH_PREFIX + "*"
+SOURCE_ACCEPTANCE_TEST_CONFIG_PATHSPEC = SOURCE_CONNECTOR_PATHSPEC + ACCEPTANCE_TEST_CONFIG_FILE_NAME
 AIRBYTE_DOCKER_REPO = "airbyte"
 SOURCE_DEFINITIONS_FILE_PATH = "airbyte-config-oss/init-oss/src/main/resources/seed/source_definitions.yaml"
 DESTINATION_DEFINITIONS_FILE_PATH = "airbyte-config-oss/init-oss/src/main/resources/seed/destination_definitions.yaml"
@@ -39,11 +46,24 @@ DEFINITIONS_FILE_PATH = {"source": SOURCE_DEFINITIONS_FILE_PATH, "destination":
 
 def download_catalog(catalog_url):
     response = requests.get(catalog_url)
+    response.raise_for_status()
     return response.json()
 
 
-OSS_CATALOG = download_catalog(OSS_CATALOG_URL)
+@lru_cache(maxsize=1)
+def get_oss_catalog() -> dict:
+    """Download the OSS catalog on first use and reuse it for the rest of the process."""
+    return download_catalog(OSS_CATALOG_URL)
+
+
 METADATA_FILE_NAME = "metadata.yaml"
+LANGUAGE_TAG_PREFIX = "language:"
+# Dockerfile instructions are case-insensitive and a LABEL instruction can span several lines with backslash continuations.
+DOCKERFILE_VERSION_LABEL_REGEX = re.compile(
+    rb"^\s*LABEL\b(?:[^\n]*\\\n)*?[^\n]*?io\.airbyte\.version\s*=\s*(\S+)", re.MULTILINE | re.IGNORECASE
+)
+DOCKERFILE_BASE_IMAGE_REGEX = re.compile(rb"^\s*FROM\s+(\S+)", re.MULTILINE)
+JAVA_BASE_IMAGE = b"airbyte/integration-base-java"
 
 
 class ConnectorInvalidNameError(Exception):
@@ -54,13 +74,75 @@ class ConnectorVersionNotFound(Exception):
     pass
 
 
+class GitCommandError(Exception):
+    pass
+
+
+def _search_file(file_path: Path, pattern: re.Pattern) -> Optional[bytes]:
+    """Scan a file for a bytes pattern in a single pass over a memory map of its content.
+
+    Args:
+        file_path (Path): Path to the file to scan.
+        pattern (re.Pattern): Compiled bytes pattern with one capturing group.
+
+    Returns:
+        Optional[bytes]: The captured group of the first match, None if the pattern was not found.
+    """
+    with open(file_path, "rb") as f:
+        # Empty files can't be memory-mapped
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                match = pattern.search(content)
+                if match:
+                    return match.group(1)
+    return None
+
+
 def read_definitions(definitions_file_path: str) -> Dict:
     with open(definitions_file_path) as definitions_file:
         return yaml.load(definitions_file, Loader=Loader)
 
 
 def get_connector_name_from_path(path):
-    return path.split("/")[2]
+    # Connector paths are expected to start with CONNECTOR_PATH_PREFIX, the connector name is the folder right after it.
+    name_end = path.find("/", CONNECTOR_NAME_OFFSET)
+    return path[CONNECTOR_NAME_OFFSET:] if name_end == -1 else path[CONNECTOR_NAME_OFFSET:name_end]
+
+
+def _run_git(git_command: List[str]) -> str:
+    """Run a git command and return its output, git's error message is kept in the raised exception."""
+    try:
+        return subprocess.run(git_command, capture_output=True, check=True, text=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise GitCommandError(f"{' '.join(git_command)} failed with exit status {e.returncode}: {e.stderr.strip()}") from e
+
+
+@lru_cache(maxsize=1)
+def _get_airbyte_repo_root() -> str:
+    """Resolve the root of the git repository the current working directory belongs to."""
+    return _run_git(["git", "rev-parse", "--show-toplevel"]).strip()
+
+
+def _git_diff_names(pathspec: str, diff_regex: Optional[str] = None) -> List[str]:
+    """List the files that were changed in the current branch (compared to DIFFED_BRANCH).
+
+    With --name-only git only computes the file deltas, no patch is generated unless diff_regex is set.
+    The git CLI is preferred to libgit2 bindings such as pygit2: they can't push the pathspec or the -G filter down to the diff
+    and have to compare the whole working tree, which is slower than a single git call on this repository.
+
+    Args:
+        pathspec (str): Only list the changed files matching this git pathspec, git filters them while walking the trees.
+        diff_regex (str): Only list the edited files that contain the following regex in their change.
+
+    Returns:
+        List[str]: Paths of the changed files, relative to the repository root.
+    """
+    diff_command = ["git", "-C", _get_airbyte_repo_root(), "diff", "--name-only", "-z"]
+    if diff_regex is not None:
+        diff_command.append(f"-G{diff_regex}")
+    diff_command += [str(DIFFED_BRANCH), "--", pathspec]
+    diff_output = _run_git(diff_command)
+    return [file_path for file_path in diff_output.split("\0") if file_path]
 
 
 def get_changed_acceptance_test_config(diff_regex: Optional[str] = None) -> Set[str]:
@@ -72,21 +154,27 @@ def get_changed_acceptance_test_config(diff_regex: Optional[str] = None) -> Set[
     Returns:
         Set[Connector]: Set of connectors that were changed
     """
-    airbyte_repo = git.Repo(search_parent_directories=True)
-
-    if diff_regex is None:
-        diff_command_args = ("--name-only", DIFFED_BRANCH)
-    else:
-        diff_command_args = ("--name-only", f"-G{diff_regex}", DIFFED_BRANCH)
-
-    changed_acceptance_test_config_paths = {
-        file_path
-        for file_path in airbyte_repo.git.diff(*diff_command_args).split("\n")
-        if file_path.startswith(SOURCE_CONNECTOR_PATH_PREFIX) and file_path.endswith(ACCEPTANCE_TEST_CONFIG_FILE_NAME)
-    }
+    changed_acceptance_test_config_paths = _git_diff_names(SOURCE_ACCEPTANCE_TEST_CONFIG_PATHSPEC, diff_regex)
     return {Connector(get_connector_name_from_path(changed_file)) for changed_file in changed_acceptance_test_config_paths}
 
 
+def _read_raw_metadata(metadata_file_path: Path) -> Optional[bytes]:
+    try:
+        return metadata_file_path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def parse_metadata(raw_metadata: Optional[bytes]) -> Optional[dict]:
+    if raw_metadata is None:
+        return None
+    return yaml.load(raw_metadata, Loader=SafeLoader)["data"]
+
+
+def read_metadata(metadata_file_path: Path) -> Optional[dict]:
+    return parse_metadata(_read_raw_metadata(metadata_file_path))
+
+
 class ConnectorLanguage(str, Enum):
     PYTHON = "python"
     JAVA = "java"
@@ -97,64 +185,72 @@ class ConnectorLanguageError(Exception):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Connector:
     """Utility class to gather metadata about a connector."""
 
     technical_name: str
 
-    def _get_type_and_name_from_technical_name(self) -> Tuple[str, str]:
-        if "-" not in self.technical_name:
+    @cached_property
+    def _type_and_name(self) -> Tuple[str, str]:
+        type_end = self.technical_name.find("-")
+        if type_end == -1:
             raise ConnectorInvalidNameError(f"Connector type and name could not be inferred from {self.technical_name}")
-        _type = self.technical_name.split("-")[0]
-        name = self.technical_name[len(_type) + 1 :]
-        return _type, name
+        return self.technical_name[:type_end], self.technical_name[type_end + 1 :]
 
     @property
     def name(self):
-        return self._get_type_and_name_from_technical_name()[1]
+        return self._type_and_name[1]
 
     @property
     def connector_type(self) -> str:
-        return self._get_type_and_name_from_technical_name()[0]
+        return self._type_and_name[0]
 
-    @property
+    @cached_property
     def documentation_file_path(self) -> Path:
         return Path(f"./docs/integrations/{self.connector_type}s/{self.name}.md")
 
-    @property
+    @cached_property
     def icon_path(self) -> Path:
         if self.metadata and self.metadata.get("icon"):
             return Path(f"./airbyte-config-oss/init-oss/src/main/resources/icons/{self.metadata['icon']}")
         return Path(f"./airbyte-config-oss/init-oss/src/main/resources/icons/{self.name}.svg")
 
-    @property
+    @cached_property
     def code_directory(self) -> Path:
         return Path(f"./airbyte-integrations/connectors/{self.technical_name}")
 
-    @property
+    @cached_property
     def metadata(self) -> Optional[dict]:
-        file_path = self.code_directory / METADATA_FILE_NAME
-        if not file_path.is_file():
-            return None
-        return yaml.safe_load((self.code_directory / METADATA_FILE_NAME).read_text())["data"]
+        return read_metadata(self.code_directory / METADATA_FILE_NAME)
 
-    @property
+    @cached_property
     def language(self) -> ConnectorLanguage:
-        if Path(self.code_directory / self.technical_name.replace("-", "_") / "manifest.yaml").is_file():
-            return ConnectorLanguage.LOW_CODE
-        if Path(self.code_directory / "setup.py").is_file():
-            return ConnectorLanguage.PYTHON
+        # The language declared in the metadata tags spares probing the connector files.
+        # Low-code connectors are also tagged as python: tags are checked in the same order as the files below.
+        metadata_tags = (self.metadata or {}).get("tags") or []
+        for language in (ConnectorLanguage.LOW_CODE, ConnectorLanguage.PYTHON, ConnectorLanguage.JAVA):
+            if f"{LANGUAGE_TAG_PREFIX}{language.value}" in metadata_tags:
+                return language
         try:
-            with open(self.code_directory / "Dockerfile") as dockerfile:
-                if "FROM airbyte/integration-base-java" in dockerfile.read():
-                    return ConnectorLanguage.JAVA
+            with os.scandir(self.code_directory) as entries:
+                entry_names = {entry.name for entry in entries}
         except FileNotFoundError:
-            pass
+            return None
+        package_name = self.technical_name.replace("-", "_")
+        if package_name in entry_names and (self.code_directory / package_name / "manifest.yaml").is_file():
+            return ConnectorLanguage.LOW_CODE
+        if "setup.py" in entry_names:
+            return ConnectorLanguage.PYTHON
+        if "Dockerfile" in entry_names:
+            # The base image is declared by the first FROM instruction.
+            base_image = _search_file(self.code_directory / "Dockerfile", DOCKERFILE_BASE_IMAGE_REGEX)
+            if base_image and base_image.startswith(JAVA_BASE_IMAGE):
+                return ConnectorLanguage.JAVA
         return None
         # raise ConnectorLanguageError(f"We could not infer {self.technical_name} connector language")
 
-    @property
+    @cached_property
     def version(self) -> str:
         if self.metadata is None:
             return self.version_in_dockerfile_label
@@ -162,10 +258,9 @@ class Connector:
 
     @property
     def version_in_dockerfile_label(self) -> str:
-        with open(self.code_directory / "Dockerfile") as f:
-            for line in f:
-                if "io.airbyte.version" in line:
-                    return line.split("=")[1].strip()
+        version = _search_file(self.code_directory / "Dockerfile", DOCKERFILE_VERSION_LABEL_REGEX)
+        if version:
+            return version.decode()
         raise ConnectorVersionNotFound(
             """
             Could not find the connector version from its Dockerfile.
@@ -185,7 +280,7 @@ class Connector:
     def suggested_streams(self) -> Optional[List[str]]:
         return self.metadata.get("suggestedStreams") if self.metadata else None
 
-    @property
+    @cached_property
     def acceptance_test_config_path(self) -> Path:
         return self.code_directory / ACCEPTANCE_TEST_CONFIG_FILE_NAME
 
@@ -193,7 +288,7 @@ class Connector:
     def acceptance_test_config(self) -> Optional[dict]:
         try:
             with open(self.acceptance_test_config_path) as acceptance_test_config_file:
-                return yaml.safe_load(acceptance_test_config_file)
+                return yaml.load(acceptance_test_config_file, Loader=SafeLoader)
         except FileNotFoundError:
             logging.warning(f"No {ACCEPTANCE_TEST_CONFIG_FILE_NAME} file found for {self.technical_name}")
             return None
@@ -218,21 +313,62 @@ class Connector:
     def __repr__(self) -> str:
         return self.technical_name
 
+    # Connectors are identified by their technical name: hash it directly instead of the fields tuple the dataclass would build.
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.technical_name == other.technical_name
+
+    def __hash__(self) -> int:
+        return hash(self.technical_name)
+
 
 def get_changed_connectors() -> Set[Connector]:
     """Retrieve a set of Connectors that were changed in the current branch (compared to master)."""
-    airbyte_repo = git.Repo(search_parent_directories=True)
-    changed_source_connector_files = {
-        file_path
-        for file_path in airbyte_repo.git.diff("--name-only", DIFFED_BRANCH).split("\n")
-        if file_path.startswith(SOURCE_CONNECTOR_PATH_PREFIX)
-    }
+    changed_source_connector_files = _git_diff_names(SOURCE_CONNECTOR_PATHSPEC)
     return {Connector(get_connector_name_from_path(changed_file)) for changed_file in changed_source_connector_files}
 
 
-def get_all_released_connectors() -> Set:
-    return {
-        Connector(Path(metadata_file).parent.name)
-        for metadata_file in glob("airbyte-integrations/connectors/**/metadata.yaml", recursive=True)
-        if "-scaffold-" not in metadata_file
-    }
+def _load_connector_metadata_bulk(connectors: Iterable[Connector]) -> Dict[str, Optional[dict]]:
+    """Read the metadata files of the connectors concurrently, parse them as they come in and prime their cached metadata property.
+
+    Parsing builds Python objects and holds the GIL, so it's done in the calling thread while the workers keep reading the next files.
+    The cached metadata property is not accessed from the worker threads: cached_property serializes its computation with a class-wide lock.
+
+    Args:
+        connectors (Iterable[Connector]): The connectors to load the metadata of.
+
+    Returns:
+        Dict[str, Optional[dict]]: The metadata of each connector, by technical name.
+    """
+    connectors = list(connectors)
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        raw_metadata_futures = {
+            executor.submit(_read_raw_metadata, connector.code_directory / METADATA_FILE_NAME): connector for connector in connectors
+        }
+        for raw_metadata_future in as_completed(raw_metadata_futures):
+            raw_metadata_futures[raw_metadata_future].__dict__["metadata"] = parse_metadata(raw_metadata_future.result())
+    return {connector.technical_name: connector.metadata for connector in connectors}
+
+
+def get_all_released_connectors(parallel: bool = False) -> Set:
+    """Retrieve the set of connectors which have a metadata file.
+
+    Args:
+        parallel (bool, optional): Load the metadata of all the connectors concurrently upfront. Defaults to False.
+
+    Returns:
+        Set[Connector]: The released connectors.
+    """
+    # Connectors live exactly one level below CONNECTOR_PATH_PREFIX, there's no need to walk their content.
+    with os.scandir(CONNECTOR_PATH_PREFIX) as entries:
+        released_connectors = {
+            Connector(entry.name)
+            for entry in entries
+            if entry.is_dir(follow_symlinks=False)
+            and "-scaffold-" not in entry.name
+            and os.path.isfile(os.path.join(entry.path, METADATA_FILE_NAME))
+        }
+    if parallel:
+        _load_connector_metadata_bulk(released_connectors)
+    return released_connectors
@@ -140,7 +140,7 @@ def test_check_connector_https_url_only(capsys, tmp_path, mocker, file_name, fil
 @pytest.mark.skip(reason="This should only be run when we want to test all connectors for their https url only compliance")
 def test_check_connector_https_url_only_all_connectors():
     failing_connectors = []
-    for raw_connector in utils.OSS_CATALOG["sources"] + utils.OSS_CATALOG["destinations"]:
+    for raw_connector in utils.get_oss_catalog()["sources"] + utils.get_oss_catalog()["destinations"]:
         technical_name = raw_connector["dockerRepository"].replace("airbyte/", "")
         connector = utils.Connector(technical_name)
         if not qa_checks.check_connector_https_url_only(connector):
@@ -9,6 +9,7 @@ import pytest
 
 from ci_connector_ops import utils
 
+
 class TestConnector:
 
     @pytest.mark.parametrize(
@@ -19,10 +20,10 @@ class TestConnector:
             ("destination-postgres", "destination", "postgres", does_not_raise()),
             ("foo", None, None, pytest.raises(utils.ConnectorInvalidNameError)),
         ])
-    def test__get_type_and_name_from_technical_name(self, technical_name, expected_type, expected_name, expected_error):
+    def test__type_and_name(self, technical_name, expected_type, expected_name, expected_error):
         connector = utils.Connector(technical_name)
         with expected_error:
-            assert connector._get_type_and_name_from_technical_name() == (expected_type, expected_name)
+            assert connector._type_and_name == (expected_type, expected_name)
             assert connector.name == expected_name
             assert connector.connector_type == expected_type
 
@@ -34,7 +35,7 @@ class TestConnector:
         ])
     def test_init(self, connector, exists, mocker, tmp_path):
         assert str(connector) == connector.technical_name
-        assert connector.connector_type, connector.name == connector._get_type_and_name_from_technical_name()
+        assert connector.connector_type, connector.name == connector._type_and_name
         assert connector.code_directory == Path(f"./airbyte-integrations/connectors/{connector.technical_name}")
         assert connector.acceptance_test_config_path == connector.code_directory / utils.ACCEPTANCE_TEST_CONFIG_FILE_NAME
         assert connector.documentation_file_path == Path(f"./docs/integrations/{connector.connector_type}s/{connector.name}.md")
@@ -56,3 +57,118 @@ class TestConnector:
                 Path(tmp_path / "Dockerfile").touch()
                 mocker.patch.object(utils.Connector, "code_directory", tmp_path)
                 utils.Connector(connector.technical_name).version
+
+    def test_metadata_is_parsed_once(self, mocker):
+        connector = utils.Connector("source-faker")
+        mocker.spy(utils.yaml, "load")
+        assert connector.metadata is connector.metadata
+        assert connector.version == connector.metadata["dockerImageTag"]
+        assert utils.yaml.load.call_count == 1
+
+    @pytest.mark.parametrize(
+        "files, expected_language",
+        [
+            ({"setup.py": "", "source_foo/manifest.yaml": ""}, utils.ConnectorLanguage.LOW_CODE),
+            ({"setup.py": "", "Dockerfile": "FROM python:3.9-slim"}, utils.ConnectorLanguage.PYTHON),
+            ({"Dockerfile": "ARG JDK_VERSION=17\nFROM airbyte/integration-base-java:dev\n"}, utils.ConnectorLanguage.JAVA),
+            ({"Dockerfile": "FROM node:14\nRUN echo 'FROM airbyte/integration-base-java'\n"}, None),
+            ({}, None),
+            ({"metadata.yaml": "data:\n  tags:\n    - language:java\n", "setup.py": ""}, utils.ConnectorLanguage.JAVA),
+            ({"metadata.yaml": "data:\n  tags:\n    - language:low-code\n"}, utils.ConnectorLanguage.LOW_CODE),
+            ({"metadata.yaml": "data:\n  tags:\n    - language:rust\n", "setup.py": ""}, utils.ConnectorLanguage.PYTHON),
+            ({"metadata.yaml": "data:\n  tags:\n    - language:python\n    - language:low-code\n"}, utils.ConnectorLanguage.LOW_CODE),
+            ({"metadata.yaml": "data:\n  tags:\n", "setup.py": ""}, utils.ConnectorLanguage.PYTHON),
+        ],
+    )
+    def test_language(self, files, expected_language, mocker, tmp_path):
+        for file_name, content in files.items():
+            (tmp_path / file_name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / file_name).write_text(content)
+        mocker.patch.object(utils.Connector, "code_directory", tmp_path)
+        assert utils.Connector("source-foo").language == expected_language
+
+    def test_language_without_code_directory(self):
+        assert utils.Connector("source-notpublished").language is None
+
+    @pytest.mark.parametrize(
+        "dockerfile_content, expected_version",
+        [
+            ("FROM python:3.9-slim\nLABEL io.airbyte.version=0.1.0\nLABEL io.airbyte.name=airbyte/source-foo\n", "0.1.0"),
+            ("LABEL io.airbyte.name=airbyte/source-foo io.airbyte.version = 1.2.3\n", "1.2.3"),
+            ("# io.airbyte.version=9.9.9\nLABEL io.airbyte.version=0.2.0\n", "0.2.0"),
+            ("LABEL io.airbyte.version=1.0.0-rc=1\n", "1.0.0-rc=1"),
+            ("LABEL io.airbyte.name=airbyte/source-foo \\\n    io.airbyte.version=0.3.1\n", "0.3.1"),
+            ("label io.airbyte.version=1.0.0\n", "1.0.0"),
+        ],
+    )
+    def test_version_in_dockerfile_label(self, dockerfile_content, expected_version, mocker, tmp_path):
+        (tmp_path / "Dockerfile").write_text(dockerfile_content)
+        mocker.patch.object(utils.Connector, "code_directory", tmp_path)
+        assert utils.Connector("source-foo").version_in_dockerfile_label == expected_version
+
+    def test_equality_and_hash(self):
+        assert utils.Connector("source-faker") == utils.Connector("source-faker")
+        assert utils.Connector("source-faker") != utils.Connector("source-pokeapi")
+        assert utils.Connector("source-faker") != "source-faker"
+        assert hash(utils.Connector("source-faker")) == hash("source-faker")
+        assert len({utils.Connector("source-faker"), utils.Connector("source-faker"), utils.Connector("source-pokeapi")}) == 2
+
+    def test_paths_are_cached(self):
+        connector = utils.Connector("source-faker")
+        assert connector.code_directory is connector.code_directory
+        assert connector.acceptance_test_config_path is connector.acceptance_test_config_path
+        assert connector.documentation_file_path is connector.documentation_file_path
+        assert connector.icon_path is connector.icon_path
+
+
+@pytest.mark.parametrize(
+    "path, expected_name",
+    [
+        ("airbyte-integrations/connectors/source-faker/metadata.yaml", "source-faker"),
+        ("airbyte-integrations/connectors/source-faker/source_faker/spec.json", "source-faker"),
+        ("airbyte-integrations/connectors/destination-postgres", "destination-postgres"),
+    ],
+)
+def test_get_connector_name_from_path(path, expected_name):
+    assert utils.get_connector_name_from_path(path) == expected_name
+
+
+def test_get_all_released_connectors(tmp_path, monkeypatch):
+    connectors_directory = tmp_path / utils.CONNECTOR_PATH_PREFIX
+    for technical_name, has_metadata in [
+        ("source-released", True),
+        ("destination-released", True),
+        ("source-not-released", False),
+        ("source-scaffold-source-http", True),
+    ]:
+        (connectors_directory / technical_name).mkdir(parents=True)
+        if has_metadata:
+            (connectors_directory / technical_name / utils.METADATA_FILE_NAME).touch()
+    monkeypatch.chdir(tmp_path)
+    assert utils.get_all_released_connectors() == {utils.Connector("source-released"), utils.Connector("destination-released")}
+
+
+def test_repo_root_is_resolved_once(mocker):
+    mocker.patch.object(utils, "DIFFED_BRANCH", "HEAD")
+    utils._get_airbyte_repo_root.cache_clear()
+    mocker.spy(utils.subprocess, "run")
+    utils.get_changed_connectors()
+    utils.get_changed_acceptance_test_config()
+    utils.get_changed_acceptance_test_config(diff_regex="bypass_reason")
+    git_commands = [call.args[0] for call in utils.subprocess.run.call_args_list]
+    assert sum("rev-parse" in git_command for git_command in git_commands) == 1
+    assert all(git_command[1:3] == ["-C", utils._get_airbyte_repo_root()] for git_command in git_commands if "diff" in git_command)
+
+
+def test_get_all_released_connectors_parallel(mocker):
+    mocker.spy(utils.yaml, "load")
+    connectors = utils.get_all_released_connectors(parallel=True)
+    assert all("metadata" in connector.__dict__ for connector in connectors)
+    assert {connector.release_stage for connector in connectors} >= {"alpha", "beta", "generally_available"}
+    assert utils.yaml.load.call_count == len(connectors)
+
+
+def test_git_errors_keep_git_message(mocker):
+    mocker.patch.object(utils, "DIFFED_BRANCH", "origin/does-not-exist")
+    with pytest.raises(utils.GitCommandError, match="fatal: bad revision"):
+        utils.get_changed_connectors()